@@ -1,20 +1,41 @@
 import os
 import time
-import subprocess
+import fcntl
+import struct
 from pathlib import Path
 from core.utils.logger import get_logger
+from core.utils.spawn import run_captured
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:  # Linux-only, optional — wait_for_device falls back to polling
+    INotify = None
 
 log = get_logger("📷 virtual-cam")
 
 # 🎛️ Constants
 V4L2_MODULE = "v4l2loopback"
 DEFAULT_DEVICE = "/dev/video10"
+SYS_MODULE_DIR = Path("/sys/module")
 MODULE_PARAMS = {
     "devices": 1,
     "video_nr": 10,
     "card_label": "MovieBotCam",
     "exclusive_caps": 1
 }
+MODPROBE_LOAD_ARGV = ("sudo", "modprobe", V4L2_MODULE) + tuple(f"{k}={v}" for k, v in MODULE_PARAMS.items())
+MODPROBE_UNLOAD_ARGV = ("sudo", "modprobe", "-r", V4L2_MODULE)
+
+# 🔌 V4L2 ioctl: _IOR('V', 0, struct v4l2_capability), a 104-byte struct
+VIDIOC_QUERYCAP = 0x80685600
+V4L2_CAPABILITY_SIZE = 104
+V4L2_CAP_HEADER = struct.Struct("16s32s")  # driver[16], card[32]
+LOOPBACK_DRIVER = b"v4l2 loopback"
+
+# 🗃️ Positive loopback probe results: path -> (st_rdev, st_mtime_ns, expiry (monotonic))
+# One slot per path, so a re-created device node replaces its stale entry
+LOOPBACK_CACHE_TTL = 30  # seconds
+_LOOPBACK_CACHE: dict[str, tuple] = {}
 
 class VirtualCamManager:
     def __init__(self, device_path=DEFAULT_DEVICE):
@@ -22,8 +43,12 @@ class VirtualCamManager:
 
     def is_module_loaded(self) -> bool:
         """Check if the v4l2loopback module is loaded."""
-        result = subprocess.run(["lsmod"], capture_output=True, text=True)
-        return V4L2_MODULE in result.stdout
+        if SYS_MODULE_DIR.is_dir():
+            return (SYS_MODULE_DIR / V4L2_MODULE).is_dir()
+
+        # /sys not mounted (e.g. some containers) — fall back to lsmod
+        _, output = run_captured(["lsmod"])
+        return V4L2_MODULE in output
 
     def load_module(self):
         """Load the v4l2loopback kernel module with specified parameters."""
@@ -31,14 +56,11 @@ class VirtualCamManager:
             log.info(f"✅ {V4L2_MODULE} already loaded.")
             return
 
-        args = ["sudo", "modprobe", V4L2_MODULE]
-        args += [f"{k}={v}" for k, v in MODULE_PARAMS.items()]
-
-        log.debug(f"🔧 Loading module with: {' '.join(args)}")
-        result = subprocess.run(args, capture_output=True, text=True)
+        log.debug(f"🔧 Loading module with: {' '.join(MODPROBE_LOAD_ARGV)}")
+        returncode, output = run_captured(MODPROBE_LOAD_ARGV)
 
-        if result.returncode != 0:
-            log.error(f"❌ Failed to load {V4L2_MODULE}: {result.stderr.strip()}")
+        if returncode != 0:
+            log.error(f"❌ Failed to load {V4L2_MODULE}: {output.strip()}")
             raise RuntimeError("Could not load v4l2loopback module.")
         log.info("🟢 v4l2loopback loaded successfully.")
 
@@ -48,15 +70,25 @@ class VirtualCamManager:
             log.info("ℹ️ v4l2loopback not loaded. Skipping unload.")
             return
 
-        result = subprocess.run(["sudo", "modprobe", "-r", V4L2_MODULE], capture_output=True, text=True)
+        returncode, output = run_captured(MODPROBE_UNLOAD_ARGV)
 
-        if result.returncode != 0:
-            log.warning(f"⚠️ Could not unload {V4L2_MODULE}: {result.stderr.strip()}")
+        if returncode != 0:
+            log.warning(f"⚠️ Could not unload {V4L2_MODULE}: {output.strip()}")
         else:
             log.info("🧹 v4l2loopback module unloaded.")
 
     def wait_for_device(self, timeout=10) -> bool:
         """Wait for the virtual camera device to become available."""
+        if INotify is not None:
+            try:
+                if self._wait_for_device_inotify(timeout):
+                    log.info(f"🎥 Virtual camera is ready at {self.device_path}")
+                    return True
+                log.error(f"⛔ Device {self.device_path} not found after {timeout} seconds.")
+                return False
+            except OSError as e:
+                log.debug(f"⚠️ inotify unavailable, falling back to polling: {e}")
+
         for i in range(timeout):
             if os.path.exists(self.device_path):
                 log.info(f"🎥 Virtual camera is ready at {self.device_path}")
@@ -67,28 +99,69 @@ class VirtualCamManager:
         log.error(f"⛔ Device {self.device_path} not found after {timeout} seconds.")
         return False
 
+    def _wait_for_device_inotify(self, timeout) -> bool:
+        """Block on an inotify watch of the device directory until the node shows up."""
+        dev_dir, dev_name = os.path.split(self.device_path)
+        deadline = time.monotonic() + timeout
+
+        with INotify() as inotify:
+            inotify.add_watch(dev_dir, inotify_flags.CREATE | inotify_flags.ATTRIB)
+            # Check only after arming the watch so a node created in between isn't missed
+            if os.path.exists(self.device_path):
+                return True
+
+            while (remaining := deadline - time.monotonic()) > 0:
+                for event in inotify.read(timeout=int(remaining * 1000)):
+                    if event.name == dev_name:
+                        return True
+        return False
+
     def get_active_virtual_cam(self) -> str | None:
         """Find the first active virtual loopback camera device."""
         if os.path.exists(self.device_path):
             return self.device_path
 
-        for dev in sorted(Path("/dev").glob("video*")):
-            if self._is_loopback_device(str(dev)):
-                return str(dev)
+        with os.scandir("/dev") as it:
+            candidates = sorted(entry.path for entry in it if entry.name.startswith("video"))
+
+        for dev_path in candidates:
+            if self._is_loopback_device(dev_path):
+                return dev_path
         return None
 
     def _is_loopback_device(self, dev_path: str) -> bool:
         try:
-            result = subprocess.run(
-                ["v4l2-ctl", "--device", dev_path, "--all"],
-                capture_output=True, text=True
-            )
-            output = result.stdout
-            return "MovieBotCam" in output or "Loopback" in output
+            st = os.stat(dev_path)
+            version = (st.st_rdev, st.st_mtime_ns)
+            now = time.monotonic()
+            cached = _LOOPBACK_CACHE.get(dev_path)
+            if cached is not None and cached[:2] == version and cached[2] > now:
+                return True
+
+            driver, card = self._query_capabilities(dev_path)
+            is_loopback = LOOPBACK_DRIVER in driver or MODULE_PARAMS["card_label"].encode() in card
+            # Only successes are cached so a device that is still initialising gets re-probed
+            if is_loopback:
+                _LOOPBACK_CACHE[dev_path] = (*version, now + LOOPBACK_CACHE_TTL)
+            else:
+                _LOOPBACK_CACHE.pop(dev_path, None)
+            return is_loopback
         except Exception as e:
             log.debug(f"⚠️ Could not verify loopback for {dev_path}: {e}")
+            _LOOPBACK_CACHE.pop(dev_path, None)
             return False
 
+    def _query_capabilities(self, dev_path: str) -> tuple[bytes, bytes]:
+        """Read the driver and card names of a V4L2 device with VIDIOC_QUERYCAP."""
+        buf = bytearray(V4L2_CAPABILITY_SIZE)
+        fd = os.open(dev_path, os.O_RDONLY | os.O_NONBLOCK)
+        try:
+            fcntl.ioctl(fd, VIDIOC_QUERYCAP, buf)
+        finally:
+            os.close(fd)
+        driver, card = V4L2_CAP_HEADER.unpack_from(buf)
+        return driver.rstrip(b"\0"), card.rstrip(b"\0")
+
     def setup(self):
         """Setup virtual camera device and verify readiness."""
         log.info("🔧 Setting up virtual camera...")
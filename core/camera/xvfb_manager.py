@@ -1,10 +1,11 @@
 import os
-import subprocess
+import select
 import signal
 import time
 import psutil
 from pathlib import Path
 from core.utils.logger import get_logger
+from core.utils.spawn import spawn_detached
 
 log = get_logger("xvfb")
 
@@ -12,8 +13,9 @@ log = get_logger("xvfb")
 XVFB_DISPLAY = ":99"
 XVFB_RESOLUTION = "1280x720x24"
 XVFB_PID_FILE = Path("/tmp/moviebot_xvfb.pid")
-XVFB_ENV = {"DISPLAY": XVFB_DISPLAY}
 XVFB_CMD = ["Xvfb", XVFB_DISPLAY, "-screen", "0", XVFB_RESOLUTION]
+XVFB_STARTUP_GRACE_MS = 200
+XVFB_STOP_GRACE_MS = 1000
 
 
 class XvfbManager:
@@ -22,6 +24,8 @@ class XvfbManager:
         self.resolution = XVFB_RESOLUTION
         self.pid_file = XVFB_PID_FILE
         self.cmd = XVFB_CMD
+        self._pidfd = None
+        self._pidfd_pid = None
 
     def is_running(self) -> bool:
         """Check if Xvfb is currently running based on PID file."""
@@ -29,12 +33,76 @@ class XvfbManager:
             return False
         try:
             pid = int(self.pid_file.read_text().strip())
+        except Exception as e:
+            log.debug(f"Xvfb check failed: {e}")
+            return False
+
+        if self._pidfd_pid == pid:
+            if self._has_exited():
+                self._reap_exited(pid)
+                return False
+            return True
+        if not self._is_xvfb_process(pid):
+            return False
+        try:
+            self._open_pidfd(pid)
+        except (OSError, AttributeError) as e:
+            log.debug(f"pidfd unavailable, staying on psutil checks: {e}")
+        return True
+
+    def _is_xvfb_process(self, pid: int) -> bool:
+        """Verify via psutil that the PID is alive (not a zombie) and actually belongs to Xvfb."""
+        try:
             proc = psutil.Process(pid)
-            return proc.is_running() and "Xvfb" in proc.name()
+            return (proc.is_running() and proc.status() != psutil.STATUS_ZOMBIE
+                    and "Xvfb" in proc.name())
         except Exception as e:
             log.debug(f"Xvfb check failed: {e}")
             return False
 
+    def _open_pidfd(self, pid: int):
+        """Cache a pidfd for the Xvfb process (Linux 5.3+)."""
+        self._close_pidfd()
+        self._pidfd = os.pidfd_open(pid)
+        self._pidfd_pid = pid
+
+    def _close_pidfd(self):
+        if self._pidfd is not None:
+            os.close(self._pidfd)
+        self._pidfd = None
+        self._pidfd_pid = None
+
+    def _has_exited(self, timeout_ms: int = 0) -> bool:
+        """Poll the cached pidfd, which becomes readable once the process exits."""
+        poller = select.poll()
+        poller.register(self._pidfd, select.POLLIN)
+        return bool(poller.poll(timeout_ms))
+
+    def _reap(self, pid: int):
+        """Collect the exit status of an Xvfb we spawned so it doesn't linger as a zombie."""
+        try:
+            os.waitpid(pid, os.WNOHANG)
+        except ChildProcessError:
+            pass  # Not our child (started by a previous run)
+
+    def _reap_exited(self, pid: int):
+        """Forget an Xvfb that has exited: collect its status and drop its pidfd."""
+        self._reap(pid)
+        self._close_pidfd()
+
+    def _exited_during_startup(self, pid: int) -> bool:
+        """Give a freshly spawned Xvfb a short grace period to fail."""
+        try:
+            self._open_pidfd(pid)
+        except (OSError, AttributeError):
+            time.sleep(1)
+            self._reap(pid)
+            return not self._is_xvfb_process(pid)
+        if self._has_exited(XVFB_STARTUP_GRACE_MS):
+            self._reap_exited(pid)
+            return True
+        return False
+
     def start(self):
         """Start Xvfb if not running."""
         if self.is_running():
@@ -43,10 +111,9 @@ class XvfbManager:
 
         try:
             log.info(f"🚀 Starting Xvfb on {self.display} with resolution {self.resolution}")
-            proc = subprocess.Popen(self.cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            self.pid_file.write_text(str(proc.pid))
-            time.sleep(1)
-            if not self.is_running():
+            pid = spawn_detached(self.cmd)
+            self.pid_file.write_text(str(pid))
+            if self._exited_during_startup(pid):
                 raise RuntimeError("Xvfb failed to start.")
             log.info("✅ Xvfb started successfully.")
         except Exception as e:
@@ -61,6 +128,10 @@ class XvfbManager:
         try:
             pid = int(self.pid_file.read_text().strip())
             os.kill(pid, signal.SIGTERM)
+            if self._pidfd_pid == pid:
+                self._has_exited(XVFB_STOP_GRACE_MS)
+            self._reap(pid)
+            self._close_pidfd()
             self.pid_file.unlink()
             log.info("🛑 Xvfb stopped cleanly.")
         except Exception as e:
@@ -76,8 +147,9 @@ class XvfbManager:
         """Ensure Xvfb is up and set DISPLAY env."""
         if not self.is_running():
             self.start()
-        os.environ["DISPLAY"] = self.display
-        log.info(f"🌐 Environment set: DISPLAY={self.display}")
+        if os.environ.get("DISPLAY") != self.display:
+            os.environ["DISPLAY"] = self.display
+            log.info(f"🌐 Environment set: DISPLAY={self.display}")
 
     def get_status(self) -> str:
         """Return string status."""
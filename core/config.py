@@ -2,12 +2,17 @@ import os
 import sys
 import shutil
 import logging
+import subprocess
 import json
 from pathlib import Path
 from dotenv import load_dotenv
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, FrozenSet
 
 CONFIG_LOADED = False
+BINARY_VERSION_TIMEOUT = 5  # seconds
+
+# Binaries that already passed the --version probe, keyed by (path, st_mtime_ns, st_size)
+_BINARY_VERIFIED: Dict[tuple, bool] = {}
 
 
 class ConfigError(Exception):
@@ -43,7 +48,9 @@ class Config:
         "DISCORD_BOT_TOKEN": None,
         "TELEGRAM_CONTROL_BOT_TOKEN": None,
         "TELEGRAM_ALLOWED_USERS": "",
-        "YTDLP_PATH": "yt-dlp"
+        "YTDLP_PATH": "yt-dlp",
+        "FFMPEG_HWACCEL": "auto",  # auto | vaapi | cuda | none
+        "FFMPEG_HWACCEL_DEVICE": "/dev/dri/renderD128"
     }
 
     def __init__(self):
@@ -81,32 +88,60 @@ class Config:
 
         self.DISCORD_BOT_TOKEN = os.getenv("DISCORD_BOT_TOKEN")
         self.TELEGRAM_CONTROL_BOT_TOKEN = os.getenv("TELEGRAM_CONTROL_BOT_TOKEN")
-        self.TELEGRAM_ALLOWED_USERS = [uid.strip() for uid in os.getenv("TELEGRAM_ALLOWED_USERS", "").split(",") if uid.strip()]
+        self.TELEGRAM_ALLOWED_USERS = self._parse_user_ids(os.getenv("TELEGRAM_ALLOWED_USERS", ""))
 
         self.FFMPEG_PATH = shutil.which(os.getenv("FFMPEG_PATH")) or os.getenv("FFMPEG_PATH")
         self.YTDLP_PATH = shutil.which(os.getenv("YTDLP_PATH", self.OPTIONAL_ENV_DEFAULTS["YTDLP_PATH"])) or "yt-dlp"
+        self.FFMPEG_HWACCEL = os.getenv("FFMPEG_HWACCEL", self.OPTIONAL_ENV_DEFAULTS["FFMPEG_HWACCEL"]).strip().lower()
+        self.FFMPEG_HWACCEL_DEVICE = os.getenv("FFMPEG_HWACCEL_DEVICE", self.OPTIONAL_ENV_DEFAULTS["FFMPEG_HWACCEL_DEVICE"])
 
         self.PLAYLIST_FILE = Path("playlist.json")
         self.CONTROL_FILE = Path("control.json")
         self.NOW_PLAYING_FILE = Path("now_playing.txt")
 
+    @staticmethod
+    def _parse_user_ids(raw: str) -> FrozenSet[int]:
+        """Parse a comma-separated list of Telegram user IDs into a set for O(1) lookups."""
+        try:
+            return frozenset(int(uid) for uid in raw.split(",") if uid.strip())
+        except ValueError:
+            raise ConfigError(f"TELEGRAM_ALLOWED_USERS must be comma-separated numeric IDs, got: {raw}")
+
     def _verify_binaries(self):
         for binary_path, name in [(self.FFMPEG_PATH, "FFmpeg"), (self.YTDLP_PATH, "yt-dlp")]:
-            if not shutil.which(binary_path):
+            try:
+                st = os.stat(binary_path)
+            except OSError:
+                st = None
+            if st is None or not os.access(binary_path, os.X_OK):
                 raise ConfigError(f"{name} not found or not executable at: {binary_path}")
 
+            # Skip the exec on reload() when the binary hasn't changed on disk
+            cache_key = (binary_path, st.st_mtime_ns, st.st_size)
+            if _BINARY_VERIFIED.get(cache_key):
+                continue
+
             try:
-                output = os.popen(f"{binary_path} --version").read()
-                if name.lower() not in output.lower():
-                    raise ConfigError(f"Invalid {name} binary output.")
+                output = subprocess.run(
+                    [binary_path, "--version"],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                    timeout=BINARY_VERSION_TIMEOUT
+                ).stdout
             except Exception as e:
                 raise ConfigError(f"Error verifying {name}: {e}")
+            if name.lower() not in output.lower():
+                raise ConfigError(f"Invalid {name} binary output.")
+            _BINARY_VERIFIED[cache_key] = True
 
     def _ensure_directories(self):
         for directory in [self.MOVIE_DATA_DIR, self.YOUTUBE_DATA_DIR, self.LOG_DIR]:
-            if not directory.exists():
-                directory.mkdir(parents=True, exist_ok=True)
+            try:
+                directory.mkdir(parents=True)
                 logging.info(f"📁 Created directory: {directory}")
+            except FileExistsError:
+                pass
             if not os.access(directory, os.W_OK):
                 raise ConfigError(f"No write permission for directory: {directory}")
 
@@ -117,12 +152,20 @@ class Config:
             self.NOW_PLAYING_FILE: ""
         }
         for file_path, default_content in defaults.items():
-            if not file_path.exists():
-                try:
-                    file_path.write_text(default_content)
-                    logging.info(f"📄 Initialized file: {file_path}")
-                except Exception as e:
-                    raise ConfigError(f"Failed to create {file_path}: {e}")
+            # O_EXCL creates the file only if it's missing, without a separate exists() check
+            try:
+                fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            except FileExistsError:
+                continue
+            except OSError as e:
+                raise ConfigError(f"Failed to create {file_path}: {e}")
+            try:
+                os.write(fd, default_content.encode())
+                logging.info(f"📄 Initialized file: {file_path}")
+            except OSError as e:
+                raise ConfigError(f"Failed to create {file_path}: {e}")
+            finally:
+                os.close(fd)
 
     def summary(self) -> Dict[str, str]:
         return {
@@ -3,15 +3,23 @@ import time
 import threading
 import logging
 from pathlib import Path
-from typing import Optional, Dict, Any, Callable
+from typing import Optional, Dict, Any, Callable, Tuple
 
 from core.utils.logger import get_logger
-from core.utils.filelock import read_locked_json, write_locked_json
+from core.utils.filelock import read_locked_json_stat, write_locked_json
 from core.queue import get_next_item, set_now_playing
 from core.player import FFmpegPlayer
 
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:  # Linux-only, optional — the watch loop falls back to polling
+    INotify = None
+
 CONTROL_FILE = Path("control.json")
 VALID_COMMANDS = {"pause", "resume", "skip", "stop", "reload"}
+# Order in which commands arriving in the same write are applied; unknown keys sort last.
+# A new stop is applied first and drops the rest of its batch, so nothing restarts playback.
+COMMAND_PRIORITY = {"stop": 0, "skip": 1, "pause": 2, "resume": 3, "reload": 4}
 
 log = get_logger("controller")
 
@@ -20,6 +28,7 @@ class ControlManager:
     def __init__(self, check_interval: int = 1):
         self.interval = check_interval
         self.last_request_ids: Dict[str, Optional[str]] = {}
+        self._last_version: Optional[Tuple[int, int]] = None  # (st_ino, st_mtime_ns) last parsed
         self.player = FFmpegPlayer()
         self.paused = False
         self.running = True
@@ -44,24 +53,57 @@ class ControlManager:
 
     def _watch_loop(self):
         """Main loop that watches control.json for new commands."""
-        while self.running:
+        if INotify is not None:
             try:
-                self._check_for_new_command()
-            except Exception as e:
-                log.exception(f"⚠️ Exception in controller loop: {e}")
+                self._watch_loop_inotify()
+                return
+            except OSError as e:
+                log.warning(f"⚠️ inotify unavailable, falling back to polling: {e}")
+
+        while self.running:
+            self._safe_check_for_new_command()
+            if not self.running:
+                break
             time.sleep(self.interval)
 
+    def _watch_loop_inotify(self):
+        """Blocks on inotify until control.json is rewritten, waking every interval to honour stop()."""
+        with INotify() as inotify:
+            inotify.add_watch(str(CONTROL_FILE.parent), inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO)
+            # Pick up anything written before the watch was armed
+            self._safe_check_for_new_command()
+
+            while self.running:
+                events = inotify.read(timeout=int(self.interval * 1000))
+                if any(event.name == CONTROL_FILE.name for event in events):
+                    self._safe_check_for_new_command()
+
+    def _safe_check_for_new_command(self):
+        try:
+            self._check_for_new_command()
+        except Exception as e:
+            log.exception(f"⚠️ Exception in controller loop: {e}")
+
     def _check_for_new_command(self):
         """Check control.json for any new or unhandled commands."""
-        if not CONTROL_FILE.exists():
+        # stat() before taking the lock so an unchanged file costs a single syscall
+        try:
+            st = CONTROL_FILE.stat()
+            if (st.st_ino, st.st_mtime_ns) == self._last_version:
+                return
+            # Record the version from the descriptor actually parsed, not the pre-check stat
+            command_data, st = read_locked_json_stat(CONTROL_FILE)
+        except FileNotFoundError:
             return
-
-        command_data = read_locked_json(CONTROL_FILE)
+        self._last_version = (st.st_ino, st.st_mtime_ns)
         if not isinstance(command_data, dict):
             log.warning("⚠️ Invalid format in control.json.")
             return
 
-        for command, payload in command_data.items():
+        ordered = sorted(command_data.items(), key=lambda item: COMMAND_PRIORITY.get(item[0], len(COMMAND_PRIORITY)))
+        for position, (command, payload) in enumerate(ordered):
+            if not self.running:
+                return
             if command not in VALID_COMMANDS:
                 log.warning(f"❌ Invalid command: {command}")
                 continue
@@ -80,6 +122,17 @@ class ControlManager:
             log.info(f"📡 Received command: {command.upper()} from {user}")
             self.last_request_ids[command] = request_id
             self._apply_command(command, user)
+            if command == "stop":
+                self._discard_superseded(ordered[position + 1:])
+                return
+
+    def _discard_superseded(self, commands):
+        """Marks commands that arrived alongside a stop as handled without running them."""
+        for command, payload in commands:
+            request_id = payload.get("id") if isinstance(payload, dict) else None
+            if command in VALID_COMMANDS and request_id and not self._is_duplicate(command, request_id):
+                self.last_request_ids[command] = request_id
+                log.info(f"🚫 {command.upper()} dropped, superseded by STOP")
 
     def _is_duplicate(self, command: str, request_id: str) -> bool:
         """Checks if a command was already processed based on its request ID."""
@@ -134,6 +187,7 @@ class ControlManager:
     def reset_state(self):
         """Resets control manager to default state."""
         self.last_request_ids.clear()
+        self._last_version = None
         self.paused = False
 
     def force_command(self, command: str):
@@ -1,8 +1,8 @@
 import os
 import json
-import uuid
+import time
 import asyncio
-from datetime import datetime
+import secrets
 
 import discord
 from discord.ext import commands, tasks
@@ -25,6 +25,17 @@ CONTROL_BUTTONS = {
     "reload": {"emoji": "🔁", "label": "Reload", "style": ButtonStyle.secondary},
 }
 
+# Button instances can't be shared between views, so only their kwargs are built once
+_BUTTON_KWARGS = tuple(
+    {
+        "label": meta["label"],
+        "emoji": meta["emoji"],
+        "style": meta["style"],
+        "custom_id": f"moviebot:{cmd}"
+    }
+    for cmd, meta in CONTROL_BUTTONS.items()
+)
+
 intents = discord.Intents.default()
 intents.guilds = True
 intents.messages = False
@@ -32,21 +43,25 @@ intents.message_content = False
 
 bot = commands.Bot(command_prefix="!", intents=intents)
 
+# Button clicks are buffered here and written to control.json by a single flusher task
+FLUSH_BATCH_DELAY = 0.05  # seconds to gather rapid clicks into one write
+_pending_commands: dict[str, dict] = {}
+_flush_event: asyncio.Event | None = None
+_flush_task: asyncio.Task | None = None
+
+# The control panel is posted once and then edited in place
+_panel_message: discord.Message | None = None
+# Last rendered panel embed, keyed by a hash of the now-playing data it was built from
+_embed_cache: tuple[int, Embed] | None = None
+
 
 class ControlView(View):
     def __init__(self, user: discord.User):
         super().__init__(timeout=None)
         self.user = user
 
-        for cmd, meta in CONTROL_BUTTONS.items():
-            self.add_item(
-                Button(
-                    label=meta["label"],
-                    emoji=meta["emoji"],
-                    style=meta["style"],
-                    custom_id=f"moviebot:{cmd}"
-                )
-            )
+        for button_kwargs in _BUTTON_KWARGS:
+            self.add_item(Button(**button_kwargs))
 
     async def interaction_check(self, interaction: Interaction) -> bool:
         # Optional: Role validation
@@ -58,8 +73,20 @@ class ControlView(View):
 
 
 def build_control_embed() -> Embed:
-    """Builds the control panel embed from the current movie metadata."""
+    """Returns the control panel embed, rebuilding it only when the now-playing data changes."""
+    global _embed_cache
     data = get_now_playing()
+    key = hash(json.dumps(data, sort_keys=True, default=str))
+    if _embed_cache is not None and _embed_cache[0] == key:
+        return _embed_cache[1]
+
+    embed = _render_control_embed(data)
+    _embed_cache = (key, embed)
+    return embed
+
+
+def _render_control_embed(data: dict | None) -> Embed:
+    """Builds the control panel embed from the current movie metadata."""
     if not data:
         return Embed(
             title="🎬 No Movie Currently Playing",
@@ -76,28 +103,78 @@ def build_control_embed() -> Embed:
         ),
         color=0x2b2d31
     )
-    embed.set_footer(text=f"Started at: {datetime.now().strftime('%H:%M:%S')}")
+    if data.get("started_at"):
+        embed.set_footer(text=f"Started at: {time.strftime('%H:%M:%S', time.localtime(data['started_at']))}")
     return embed
 
 
 async def post_control_panel():
-    """Clears the last few messages and posts the control embed."""
+    """Refreshes the control panel in place, posting a new one only if none exists yet."""
+    global _panel_message
     try:
+        embed = await asyncio.to_thread(build_control_embed)
+        view = ControlView(user=bot.user)
+
+        if _panel_message is not None:
+            try:
+                await _panel_message.edit(embed=embed, view=view)
+                log.debug("🔄 Refreshed control panel.")
+                return
+            except discord.NotFound:
+                log.warning("⚠️ Control panel message was deleted. Posting a new one.")
+                _panel_message = None
+
         channel: TextChannel = bot.get_channel(int(Config.DISCORD_CHANNEL_ID))
         if not channel:
             log.error("❌ Invalid Discord channel ID. Channel not found.")
             return
 
-        await channel.purge(limit=5)
-        embed = build_control_embed()
-        view = ControlView(user=bot.user)
-        await channel.send(embed=embed, view=view)
+        _panel_message = await channel.send(embed=embed, view=view)
         log.info("✅ Posted control panel to Discord.")
 
     except Exception as e:
         log.error(f"⚠️ Could not post control panel: {e}")
 
 
+def _merge_into_control_file(batch: dict[str, dict]):
+    data = read_locked_json(CONTROL_FILE)
+    if not isinstance(data, dict):
+        data = {}
+    data.update(batch)
+    write_locked_json(CONTROL_FILE, data)
+
+
+async def _flush_commands():
+    """Writes buffered commands in one merge and refreshes the control panel once per batch."""
+    while True:
+        await _flush_event.wait()
+        await asyncio.sleep(FLUSH_BATCH_DELAY)
+        _flush_event.clear()
+
+        batch = dict(_pending_commands)
+        _pending_commands.clear()
+        try:
+            await asyncio.to_thread(_merge_into_control_file, batch)
+            log.debug(f"💾 Flushed {len(batch)} command(s) to {CONTROL_FILE}")
+        except Exception as e:
+            log.error(f"❌ Failed to write commands {list(batch)}: {e}")
+
+        await post_control_panel()
+
+
+def queue_command(command: str, user: str):
+    """Buffers a control command for the background flusher, starting it on first use."""
+    global _flush_event, _flush_task
+    _pending_commands[command] = {
+        "id": secrets.token_hex(8),
+        "user": user
+    }
+    if _flush_task is None or _flush_task.done():
+        _flush_event = asyncio.Event()
+        _flush_task = asyncio.create_task(_flush_commands())
+    _flush_event.set()
+
+
 @bot.event
 async def on_ready():
     log.info(f"✅ Logged in as: {bot.user} (ID: {bot.user.id})")
@@ -119,22 +196,11 @@ async def on_interaction(interaction: Interaction):
         return
 
     try:
-        data = read_locked_json(CONTROL_FILE)
-        if not isinstance(data, dict):
-            data = {}
-
-        data[command] = {
-            "id": str(uuid.uuid4()),
-            "user": interaction.user.name
-        }
-
-        write_locked_json(CONTROL_FILE, data)
+        # File write and panel refresh happen in the flusher, coalesced across rapid clicks
+        queue_command(command, interaction.user.name)
         log.info(f"📥 {interaction.user.name} issued `{command}`")
         await interaction.response.send_message(f"✅ `{command}` command sent.", ephemeral=True)
 
-        # Optional: Immediately refresh embed panel after interaction
-        await post_control_panel()
-
     except Exception as e:
         log.error(f"❌ Failed to process interaction: {e}")
         await interaction.response.send_message("⚠️ Command failed to send.", ephemeral=True)
@@ -1,5 +1,5 @@
 import os
-import subprocess
+import select
 import threading
 import time
 import json
@@ -9,7 +9,14 @@ from datetime import datetime
 from typing import Optional, Tuple, List
 
 from core.config import config
-from core.utils.filelock import FileLock
+from core.utils import fastjson
+from core.utils.filelock import FileLock, atomic_write_json, write_locked_json
+from core.utils.spawn import SpawnedProcess, run_captured, spawn_detached
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:  # Linux-only, optional — playback falls back to 1s polling
+    INotify = None
 
 log = logging.getLogger("🎬 MoviePlayer")
 log.setLevel(logging.DEBUG)
@@ -17,6 +24,13 @@ fh = logging.FileHandler(config.LOG_DIR / "player.log")
 fh.setFormatter(logging.Formatter("[%(asctime)s] [%(levelname)s] %(message)s"))
 log.addHandler(fh)
 
+FFMPEG_STOP_TIMEOUT = 5  # seconds to wait for FFmpeg to exit after SIGTERM
+
+# 🎛️ Hardware decode: tried in this order when FFMPEG_HWACCEL=auto
+HWACCEL_PREFERENCE = ("vaapi", "cuda")
+HWACCEL_PROBE_TIMEOUT = 10  # seconds allowed for `ffmpeg -hwaccels`
+HWACCEL_FAILFAST_SECONDS = 5  # An FFmpeg failure this soon after launch may be a hw init error
+
 
 class MoviePlayer:
     def __init__(self):
@@ -26,16 +40,61 @@ class MoviePlayer:
         self.ffmpeg_path = config.FFMPEG_PATH
         self.virtual_cam = "/dev/video0"
         self.running = False
-        self.process: Optional[subprocess.Popen] = None
+        self.process: Optional[SpawnedProcess] = None
         self.retry_limit = 3
+        self.hwaccel_args = self._detect_hwaccel()
+        self._ctl_version = None  # (st_ino, st_mtime_ns) of the control.json last parsed
+        self._ctl_skip = False
+        self._inotify = self._create_control_watch()
+
+    def _detect_hwaccel(self) -> List[str]:
+        """Picks a decode accelerator from `ffmpeg -hwaccels`; an empty list means software decode."""
+        wanted = config.FFMPEG_HWACCEL
+        if wanted in ("", "none", "off"):
+            return []
+        try:
+            code, output = run_captured((self.ffmpeg_path, "-hide_banner", "-hwaccels"),
+                                        timeout=HWACCEL_PROBE_TIMEOUT)
+        except OSError as e:  # Includes TimeoutError
+            log.warning(f"⚠️ Could not query FFmpeg hwaccels: {e}")
+            return []
+        available = set(output.split()) if code == 0 else set()
+
+        candidates = HWACCEL_PREFERENCE if wanted == "auto" else (wanted,)
+        for method in candidates:
+            if method not in available:
+                continue
+            if method == "vaapi":
+                if not os.path.exists(config.FFMPEG_HWACCEL_DEVICE):
+                    continue
+                args = ["-hwaccel", "vaapi", "-hwaccel_device", config.FFMPEG_HWACCEL_DEVICE]
+            else:
+                args = ["-hwaccel", method]
+            log.info(f"🎛️ Using {method} hardware decoding")
+            return args
+
+        if wanted != "auto":
+            log.warning(f"⚠️ Requested hwaccel '{wanted}' is not available, using software decoding")
+        return []
+
+    def _create_control_watch(self):
+        """Watches control.json's directory so playback only wakes when a command is written."""
+        if INotify is None:
+            return None
+        try:
+            inotify = INotify()
+            inotify.add_watch(str(self.control.resolve().parent), inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO)
+            return inotify
+        except OSError as e:
+            log.warning(f"⚠️ inotify unavailable, polling control file instead: {e}")
+            return None
 
     def get_next_video(self) -> Tuple[Optional[dict], Optional[List[dict]]]:
         with FileLock(str(self.playlist)):
             if not self.playlist.exists():
                 return None, None
             try:
-                with open(self.playlist, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                data = fastjson.loads(self.playlist.read_bytes())
                 if not data:
                     return None, data
                 return data.pop(0), data
@@ -44,9 +103,7 @@ class MoviePlayer:
                 return None, []
 
     def write_updated_playlist(self, updated: List[dict]):
-        with FileLock(str(self.playlist)):
-            with open(self.playlist, "w", encoding="utf-8") as f:
-                json.dump(updated, f, indent=2)
+        write_locked_json(self.playlist, updated)
 
     def update_now_playing(self, metadata: dict):
         with FileLock(str(self.now_playing)):
@@ -60,31 +117,49 @@ class MoviePlayer:
                 f.write("")
         log.info("🧹 Cleared now_playing.txt")
 
-    def launch_ffmpeg(self, file_path: str) -> subprocess.Popen:
+    def launch_ffmpeg(self, file_path: str) -> SpawnedProcess:
+        # Decoded frames are downloaded to system memory (no -hwaccel_output_format):
+        # the v4l2 loopback muxer only accepts raw frames it can copy
         cmd = [
-            self.ffmpeg_path, "-re", "-i", file_path,
+            self.ffmpeg_path, *self.hwaccel_args, "-re", "-i", file_path,
             "-map", "0:v:0", "-f", "v4l2", self.virtual_cam
         ]
         log.info(f"📽️ Launching FFmpeg: {' '.join(cmd)}")
-        return subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        # posix_spawn (vfork-based) avoids copying the bot's page tables on every video start
+        return SpawnedProcess(spawn_detached(cmd))
+
+    def _terminate_ffmpeg(self):
+        """SIGTERMs FFmpeg and reaps it, escalating to SIGKILL if it does not exit in time."""
+        self.process.terminate()
+        if self.process.wait(FFMPEG_STOP_TIMEOUT) is None:
+            log.warning("⚠️ FFmpeg ignored SIGTERM, killing it")
+            self.process.kill()
+            self.process.wait()
 
     def should_skip(self) -> bool:
         try:
-            with FileLock(str(self.control)):
-                if not self.control.exists():
-                    return False
-                with open(self.control, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                return data.get("skip", False)
+            st = os.stat(self.control)
+        except FileNotFoundError:
+            return False
+        # Each atomic replace is a new inode, so this catches rewrites within one mtime tick too
+        version = (st.st_ino, st.st_mtime_ns)
+        if version == self._ctl_version:
+            return self._ctl_skip
+        try:
+            # Writers replace control.json atomically, so a plain read is always complete
+            data = fastjson.loads(self.control.read_bytes())
+            self._ctl_skip = bool(data.get("skip", False))
+            self._ctl_version = version
+            return self._ctl_skip
+        except FileNotFoundError:
+            return False
         except Exception as e:
             log.error(f"🚫 Failed to read control file: {e}")
             return False
 
     def reset_controls(self):
         try:
-            with FileLock(str(self.control)):
-                with open(self.control, "w", encoding="utf-8") as f:
-                    json.dump({}, f)
+            atomic_write_json(self.control, {})
             log.info("🔄 Reset control.json")
         except Exception as e:
             log.error(f"⚠️ Reset control file failed: {e}")
@@ -98,29 +173,91 @@ class MoviePlayer:
 
         self.update_now_playing(video)
         self.process = self.launch_ffmpeg(file_path)
-        start_time = time.time()
         duration = video.get("duration", 0)
         max_play = duration if duration > 0 else 3600
 
         log.info(f"▶️ Streaming for {max_play}s")
-        while time.time() - start_time < max_play:
-            if self.should_skip():
-                log.info("⏭️ Skip command received")
-                self.reset_controls()
-                break
-            if self.process.poll() is not None:
-                log.warning("⚠️ FFmpeg exited early")
-                break
-            time.sleep(1)
+        started = time.monotonic()
+        outcome = self._wait_for_playback(max_play)
+        if self.hwaccel_args and self._failed_fast(outcome, started):
+            log.warning("⚠️ FFmpeg failed right after launch, retrying with software decoding")
+            hwaccel_args, self.hwaccel_args = self.hwaccel_args, []
+            started = time.monotonic()
+            self.process = self.launch_ffmpeg(file_path)
+            outcome = self._wait_for_playback(max_play)
+            if self._failed_fast(outcome, started):
+                # Software failed the same way, so the file is at fault, not the decoder
+                self.hwaccel_args = hwaccel_args
+            else:
+                log.warning("⚠️ Hardware decoding failed, falling back to software for this session")
+        if outcome == "skip":
+            log.info("⏭️ Skip command received")
+            self.reset_controls()
+        elif outcome == "exited":
+            log.warning("⚠️ FFmpeg exited early")
 
         if self.process and self.process.poll() is None:
-            self.process.terminate()
+            self._terminate_ffmpeg()
             log.info("⛔ FFmpeg terminated")
 
         self.clear_now_playing()
         self.write_updated_playlist(updated_playlist)
         time.sleep(1)
 
+    def _failed_fast(self, outcome: str, started: float) -> bool:
+        """True when FFmpeg exited with an error within HWACCEL_FAILFAST_SECONDS of launch."""
+        return (outcome == "exited" and self.process.poll() != 0
+                and time.monotonic() - started < HWACCEL_FAILFAST_SECONDS)
+
+    def _wait_for_playback(self, max_play: float) -> str:
+        """
+        Blocks until a skip is requested ("skip"), FFmpeg exits ("exited")
+        or max_play seconds elapse ("timeout").
+        """
+        if self._inotify is None:
+            return self._poll_playback(max_play)
+
+        deadline = time.monotonic() + max_play
+        try:
+            pidfd = os.pidfd_open(self.process.pid)
+        except (OSError, AttributeError):
+            pidfd = None  # FFmpeg exit is then only noticed once per second
+
+        poller = select.poll()
+        poller.register(self._inotify.fileno(), select.POLLIN)
+        if pidfd is not None:
+            poller.register(pidfd, select.POLLIN)
+
+        try:
+            # A command written before the watch woke us (or between videos) still counts
+            self._inotify.read(timeout=0)
+            if self.should_skip():
+                return "skip"
+
+            while (remaining := deadline - time.monotonic()) > 0:
+                timeout = remaining if pidfd is not None else min(remaining, 1)
+                ready = {fd for fd, _ in poller.poll(timeout * 1000)}
+                if self._inotify.fileno() in ready:
+                    events = self._inotify.read(timeout=0)
+                    if any(event.name == self.control.name for event in events) and self.should_skip():
+                        return "skip"
+                if self.process.poll() is not None:
+                    return "exited"
+            return "timeout"
+        finally:
+            if pidfd is not None:
+                os.close(pidfd)
+
+    def _poll_playback(self, max_play: float) -> str:
+        start_time = time.time()
+        while time.time() - start_time < max_play:
+            if self.should_skip():
+                return "skip"
+            if self.process.poll() is not None:
+                return "exited"
+            time.sleep(1)
+        return "timeout"
+
     def play_loop(self):
         self.running = True
         log.info("🔁 Entering playback loop")
@@ -150,7 +287,7 @@ class MoviePlayer:
     def stop(self):
         self.running = False
         if self.process and self.process.poll() is None:
-            self.process.terminate()
+            self._terminate_ffmpeg()
             log.info("🛑 FFmpeg stopped")
 
 
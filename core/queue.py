@@ -1,22 +1,30 @@
 import os
-import json
-import uuid
 import time
-from typing import List, Optional, Dict, Any
+import secrets
+import threading
+from typing import List, Optional, Dict, Any, Tuple
 from pathlib import Path
 
+from core.utils import fastjson
 from core.utils.logger import get_logger
-from core.utils.filelock import read_locked_json, write_locked_json
+from core.utils.filelock import read_locked_json, read_locked_json_stat, write_locked_json
 
 log = get_logger("📂 queue")
 
 PLAYLIST_PATH = Path("playlist.json")
 NOW_PLAYING_PATH = Path("now_playing.txt")
 
+# Parsed copy of playlist.json, revalidated against the file's (st_ino, st_mtime_ns) on every
+# access; the inode changes on every atomic rewrite even when the mtime tick does not.
+# "total" is the summed duration of "data" and "index" maps entry id -> position in "data";
+# both are derived whenever the cache is replaced.
+_CACHE: Dict[str, Any] = {"version": None, "data": [], "total": 0, "index": {}}
+_cache_lock = threading.Lock()
+
 
 def _generate_entry(title: str, filepath: str, duration: int, source: str, added_by: str) -> Dict[str, Any]:
     return {
-        "id": str(uuid.uuid4()),
+        "id": secrets.token_hex(8),
         "title": title,
         "filepath": filepath,
         "duration": duration,
@@ -36,16 +44,74 @@ def load_playlist() -> List[Dict[str, Any]]:
         return []
 
 
+def _load_cached() -> List[Dict[str, Any]]:
+    """Returns the parsed playlist, re-reading the file only when it was replaced or modified.
+
+    The returned list is shared with the cache; callers that mutate it must copy it first.
+    """
+    return _load_indexed()[0]
+
+
+def _load_indexed() -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """Like _load_cached, but also returns the id -> position index built for that same list."""
+    try:
+        st = PLAYLIST_PATH.stat()
+    except FileNotFoundError:
+        _invalidate_cache()
+        return [], {}
+
+    with _cache_lock:
+        if _CACHE["version"] == (st.st_ino, st.st_mtime_ns):
+            return _CACHE["data"], _CACHE["index"]
+
+    try:
+        data, st = read_locked_json_stat(PLAYLIST_PATH)
+        if not isinstance(data, list) or not all(isinstance(entry, dict) for entry in data):
+            raise ValueError("expected a JSON list of entry objects")
+        return data, _store_cache((st.st_ino, st.st_mtime_ns), data)
+    except Exception as e:
+        _invalidate_cache()
+        log.error(f"📛 Failed to load playlist: {e}")
+        return [], {}
+
+
+def _duration(entry: Dict[str, Any]) -> int:
+    """Entry duration in seconds; a missing, null or malformed value counts as 0."""
+    try:
+        return int(entry.get("duration") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _store_cache(version: Optional[Tuple[int, int]], data: List[Dict[str, Any]]) -> Dict[str, int]:
+    total = sum(_duration(entry) for entry in data)
+    index: Dict[str, int] = {}
+    for i, entry in enumerate(data):
+        index.setdefault(entry.get("id"), i)  # First occurrence wins, as a linear scan would
+    with _cache_lock:
+        _CACHE["version"] = version
+        _CACHE["data"] = data
+        _CACHE["total"] = total
+        _CACHE["index"] = index
+    return index
+
+
+def _invalidate_cache() -> None:
+    _store_cache(None, [])
+
+
 def save_playlist(data: List[Dict[str, Any]]) -> None:
     try:
-        write_locked_json(PLAYLIST_PATH, data)
+        st = write_locked_json(PLAYLIST_PATH, data)
+        _store_cache((st.st_ino, st.st_mtime_ns), data)
         log.debug("💾 Playlist saved successfully.")
     except Exception as e:
+        _invalidate_cache()
         log.error(f"📛 Failed to save playlist: {e}")
 
 
 def add_to_queue(title: str, filepath: str, duration: int, source: str, added_by: str) -> Dict[str, Any]:
-    queue = load_playlist()
+    queue = list(_load_cached())
     new_entry = _generate_entry(title, filepath, duration, source, added_by)
     queue.append(new_entry)
     save_playlist(queue)
@@ -54,26 +120,28 @@ def add_to_queue(title: str, filepath: str, duration: int, source: str, added_by
 
 
 def get_queue() -> List[Dict[str, Any]]:
-    return load_playlist()
+    return list(_load_cached())
 
 
 def pin_next(entry_id: str) -> bool:
-    queue = load_playlist()
-    for i, entry in enumerate(queue):
-        if entry["id"] == entry_id:
-            pinned = queue.pop(i)
-            queue.insert(0, pinned)
-            save_playlist(queue)
-            log.info(f"📌 Pinned next: {pinned['title']}")
-            return True
+    cached, index = _load_indexed()
+    i = index.get(entry_id)
+    if i is not None:
+        queue = list(cached)
+        pinned = queue.pop(i)
+        queue.insert(0, pinned)
+        save_playlist(queue)
+        log.info(f"📌 Pinned next: {pinned['title']}")
+        return True
     log.warning(f"❌ Failed to pin, ID not found: {entry_id}")
     return False
 
 
 def remove_by_id(entry_id: str) -> bool:
-    queue = load_playlist()
-    new_queue = [q for q in queue if q["id"] != entry_id]
-    if len(new_queue) < len(queue):
+    queue, index = _load_indexed()
+    if entry_id in index:
+        # Duplicate IDs are all dropped, matching the old filter
+        new_queue = [q for q in queue if q["id"] != entry_id]
         save_playlist(new_queue)
         log.info(f"🗑️ Removed entry by ID: {entry_id}")
         return True
@@ -87,12 +155,12 @@ def clear_queue() -> None:
 
 
 def get_next_item() -> Optional[Dict[str, Any]]:
-    queue = load_playlist()
-    return queue[0] if queue else None
+    queue = _load_cached()
+    return dict(queue[0]) if queue else None  # Copy, so callers can't alter the cached entry
 
 
 def remove_current() -> Optional[Dict[str, Any]]:
-    queue = load_playlist()
+    queue = list(_load_cached())
     if not queue:
         return None
     removed = queue.pop(0)
@@ -106,19 +174,20 @@ def peek_current() -> Optional[Dict[str, Any]]:
 
 
 def is_empty() -> bool:
-    return len(load_playlist()) == 0
+    return len(_load_cached()) == 0
 
 
 def get_total_duration() -> int:
-    total = sum(int(entry.get("duration", 0)) for entry in load_playlist())
+    _load_cached()
+    total = _CACHE["total"]
     log.debug(f"⏱️ Total playlist duration: {total}s")
     return total
 
 
 def set_now_playing(entry: Dict[str, Any]) -> None:
     try:
-        with NOW_PLAYING_PATH.open("w", encoding="utf-8") as f:
-            f.write(json.dumps({
+        with NOW_PLAYING_PATH.open("wb") as f:
+            f.write(fastjson.dumps({
                 "id": entry.get("id"),
                 "filepath": entry.get("filepath"),
                 "timestamp": int(time.time())
@@ -132,19 +201,20 @@ def get_now_playing() -> Optional[Dict[str, Any]]:
     if not NOW_PLAYING_PATH.exists():
         return None
     try:
-        with NOW_PLAYING_PATH.open("r", encoding="utf-8") as f:
-            now_data = json.load(f)
-        queue = load_playlist()
+        now_data = fastjson.loads(NOW_PLAYING_PATH.read_bytes())
+        queue = _load_cached()
+        started_at = now_data.get("timestamp", 0)
         for entry in queue:
             if entry["filepath"] == now_data.get("filepath"):
-                return entry
+                return {**entry, "started_at": started_at}
         return {
             "title": Path(now_data.get("filepath", "")).stem,
             "filepath": now_data.get("filepath"),
             "duration": 0,
             "type": "unknown",
             "added_by": "unknown",
-            "timestamp": now_data.get("timestamp", 0)
+            "timestamp": started_at,
+            "started_at": started_at
         }
     except Exception as e:
         log.error(f"❌ Failed to parse now_playing.txt: {e}")
@@ -152,23 +222,22 @@ def get_now_playing() -> Optional[Dict[str, Any]]:
 
 
 def get_by_id(entry_id: str) -> Optional[Dict[str, Any]]:
-    for entry in load_playlist():
-        if entry.get("id") == entry_id:
-            log.debug(f"🔍 Found entry by ID: {entry_id}")
-            return entry
+    queue, index = _load_indexed()
+    i = index.get(entry_id)
+    if i is not None:
+        log.debug(f"🔍 Found entry by ID: {entry_id}")
+        return dict(queue[i])  # Copy: the cached entry is shared with every other reader
     log.warning(f"🔎 Entry ID not found: {entry_id}")
     return None
 
 
 def update_entry(entry_id: str, new_data: Dict[str, Any]) -> bool:
-    queue = load_playlist()
-    updated = False
-    for entry in queue:
-        if entry["id"] == entry_id:
-            entry.update(new_data)
-            updated = True
-            break
+    cached, index = _load_indexed()
+    i = index.get(entry_id)
+    updated = i is not None
     if updated:
+        queue = list(cached)
+        queue[i] = {**queue[i], **new_data}
         save_playlist(queue)
         log.info(f"✏️ Updated entry ID: {entry_id}")
     else:
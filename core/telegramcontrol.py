@@ -1,4 +1,6 @@
-import uuid
+import asyncio
+import secrets
+from functools import lru_cache
 from pathlib import Path
 
 from telegram import Update, constants
@@ -8,46 +10,61 @@ from telegram.ext import (
     ContextTypes,
 )
 
-from core.config import Config
+from core.config import config
 from core.utils.logger import get_logger
-from core.utils.filelock import write_locked_json
+from core.utils.filelock import atomic_write_json
 from core.queue import get_now_playing, get_queue
 
 log = get_logger("📱 telegram-control")
 
 # 📁 Paths and Authorization
 CONTROL_FILE = Path("control.json")
-WHITELIST_USERS = set(Config.TELEGRAM_ALLOWED_USERS.split(",")) if Config.TELEGRAM_ALLOWED_USERS else set()
+# The config instance already parses TELEGRAM_ALLOWED_USERS into numeric IDs
+WHITELIST_USERS = frozenset(config.TELEGRAM_ALLOWED_USERS)
 
 # 🔐 Utility: Check if a user is authorized
 def is_authorized(user_id: int) -> bool:
-    return not WHITELIST_USERS or str(user_id) in WHITELIST_USERS
+    return not WHITELIST_USERS or user_id in WHITELIST_USERS
 
 # 🔣 Utility: Escape special characters for Telegram MarkdownV2
+_MARKDOWN_V2_ESCAPES = str.maketrans({char: f"\\{char}" for char in "\\_*[]()~`>#+-=|{}.!"})
+
 def markdown_escape(text: str) -> str:
-    escape_chars = r"\\_*[]()~`>#+-=|{}.!"
-    for char in escape_chars:
-        text = text.replace(char, f"\\{char}")
-    return text
+    return text.translate(_MARKDOWN_V2_ESCAPES)
+
+# 🧾 Utility: Rendered /queue row, cached so repeat listings skip the escaping
+QUEUE_PREVIEW_LIMIT = 10
+
+def render_queue_row(title, duration, added_by) -> str:
+    # Stringify first: a hand-edited entry may hold lists or dicts, which lru_cache can't hash
+    return _render_queue_row(str(title), str(duration), str(added_by))
+
+@lru_cache(maxsize=256)
+def _render_queue_row(title: str, duration: str, added_by: str) -> str:
+    return f"`{markdown_escape(title)}` – {duration}s by `{markdown_escape(added_by)}`"
 
 # 🧠 Utility: Response messages for each control command
+_RESPONSES = {
+    "pause": "⏸️ Movie playback paused.",
+    "resume": "▶️ Playback resumed.",
+    "skip": "⏭️ Skipped to next video in queue.",
+    "stop": "⏹️ Playback stopped.",
+}
+_DEFAULT_RESPONSE = "✅ Command sent successfully."
+
 def build_response_message(command: str) -> str:
-    return {
-        "pause": "⏸️ Movie playback paused.",
-        "resume": "▶️ Playback resumed.",
-        "skip": "⏭️ Skipped to next video in queue.",
-        "stop": "⏹️ Playback stopped.",
-    }.get(command, "✅ Command sent successfully.")
+    return _RESPONSES.get(command, _DEFAULT_RESPONSE)
 
 # 📤 Send control signal to MovieBot core
 async def send_control_signal(command: str, user: str):
     signal = {
         command: {
-            "id": str(uuid.uuid4()),
+            "id": secrets.token_hex(8),
             "user": user
         }
     }
-    write_locked_json(CONTROL_FILE, signal)
+    # File I/O runs in a worker so it never stalls the polling loop
+    await asyncio.to_thread(atomic_write_json, CONTROL_FILE, signal)
     log.info(f"📡 Control issued: {command} by {user}")
 
 # 🧩 General control handler for shared logic
@@ -78,7 +95,7 @@ async def stop(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 # 🎥 Show current playing item
 async def nowplaying(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    now = get_now_playing()
+    now = await asyncio.to_thread(get_now_playing)
 
     if not now:
         await update.message.reply_text("🎬 No movie is currently playing.")
@@ -100,20 +117,17 @@ async def nowplaying(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 # 📋 Show the upcoming queue (limited to 10 entries)
 async def queue(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    q = get_queue()
+    q = await asyncio.to_thread(get_queue)
 
     if not q:
         await update.message.reply_text("📭 The queue is currently empty.")
         return
 
-    msg = ["*🎞️ Upcoming Queue:*\n"]
-    for i, item in enumerate(q[:10], start=1):
-        title = markdown_escape(item['title'])
-        added_by = markdown_escape(item['added_by'])
-        duration = item.get('duration', 0)
-        msg.append(f"{i}. `{title}` – {duration}s by `{added_by}`")
-
-    await update.message.reply_text("\n".join(msg), parse_mode=constants.ParseMode.MARKDOWN_V2)
+    rows = "\n".join(
+        f"{i}. {render_queue_row(item['title'], item.get('duration', 0), item['added_by'])}"
+        for i, item in enumerate(q[:QUEUE_PREVIEW_LIMIT], start=1)
+    )
+    await update.message.reply_text(f"*🎞️ Upcoming Queue:*\n\n{rows}", parse_mode=constants.ParseMode.MARKDOWN_V2)
 
 # 🧾 Status = now playing + queue
 async def status(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -121,24 +135,25 @@ async def status(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await queue(update, context)
 
 # 📖 Help command with Markdown formatting and emojis
+_HELP_TEXT = (
+    "*🎮 MovieBot Control Commands:*\n"
+    "\n"
+    "`/pause` – ⏸️ Pause playback\n"
+    "`/resume` – ▶️ Resume playback\n"
+    "`/skip` – ⏭️ Skip to next\n"
+    "`/stop` – ⏹️ Stop playback\n"
+    "`/nowplaying` – 🎬 Show current video\n"
+    "`/queue` – 📝 Show next 10 queued\n"
+    "`/status` – 📊 Playback + Queue info\n"
+    "`/help` – ❓ This help message"
+)
+
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    help_text = (
-        "*🎮 MovieBot Control Commands:*\n"
-        "\n"
-        "`/pause` – ⏸️ Pause playback\n"
-        "`/resume` – ▶️ Resume playback\n"
-        "`/skip` – ⏭️ Skip to next\n"
-        "`/stop` – ⏹️ Stop playback\n"
-        "`/nowplaying` – 🎬 Show current video\n"
-        "`/queue` – 📝 Show next 10 queued\n"
-        "`/status` – 📊 Playback + Queue info\n"
-        "`/help` – ❓ This help message"
-    )
-    await update.message.reply_text(help_text, parse_mode=constants.ParseMode.MARKDOWN_V2)
+    await update.message.reply_text(_HELP_TEXT, parse_mode=constants.ParseMode.MARKDOWN_V2)
 
 # 🚀 Launch Telegram Control Bot
 def run_telegram_bot():
-    app = ApplicationBuilder().token(Config.TELEGRAM_CONTROL_BOT_TOKEN).build()
+    app = ApplicationBuilder().token(config.TELEGRAM_CONTROL_BOT_TOKEN).build()
 
     # Register command handlers
     app.add_handler(CommandHandler("pause", pause))
@@ -1,16 +1,15 @@
 import os
 import re
-import json
 import shutil
 import asyncio
 import logging
-import subprocess
 from pathlib import Path
 from datetime import datetime
 from urllib.parse import urlparse
 
 from telegram import Update, constants
 from telegram.ext import Application, MessageHandler, filters, ContextTypes
+from yt_dlp import YoutubeDL
 
 from core.config import Config
 from core.queue import add_to_queue
@@ -20,13 +19,15 @@ from core.utils.logger import get_logger
 log = get_logger("📤 uploader")
 
 MOVIE_EXTENSIONS = [".mp4", ".mkv"]
-YOUTUBE_REGEX = re.compile(r"(https?://)?(www\.)?(youtube\.com|youtu\.be)/.+", re.IGNORECASE)
+# Only used with .match(): one character after the slash is enough, so don't scan the rest of the line
+YOUTUBE_REGEX = re.compile(r"(https?://)?(www\.)?(youtube\.com|youtu\.be)/.", re.IGNORECASE)
+YTDLP_FORMAT = "bestvideo[ext=mp4]+bestaudio[ext=m4a]/mp4"
+COPY_CHUNK_SIZE = 1 << 30  # copy_file_range() request size; the kernel may do less per call
 
 # 🎬 Main handler for uploads
 async def handle_upload(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     message = update.message
     user = message.from_user.full_name
-    timestamp = int(datetime.now().timestamp())
 
     if message.document or message.video:
         file = message.document or message.video
@@ -40,13 +41,12 @@ async def handle_upload(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
             file_path = await download_file(file, Config.MOVIE_DIR)
             metadata = build_metadata(
                 title=Path(file_path).stem,
-                file_path=str(file_path),
+                filepath=str(file_path),
                 duration=getattr(file, 'duration', 0),
-                file_type="upload",
-                added_by=user,
-                timestamp=timestamp
+                source="upload",
+                added_by=user
             )
-            add_to_queue(**metadata)
+            await asyncio.to_thread(add_to_queue, **metadata)
             await message.reply_text(f"✅ *Uploaded & Queued:*\n`{metadata['title']}`", parse_mode=constants.ParseMode.MARKDOWN)
             log.info(f"📥 File uploaded by {user}: {file_path}")
         except Exception as e:
@@ -59,13 +59,12 @@ async def handle_upload(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
             yt_meta = await download_youtube_video(url, Config.YOUTUBE_DIR)
             metadata = build_metadata(
                 title=yt_meta["title"],
-                file_path=yt_meta["filepath"],
+                filepath=yt_meta["filepath"],
                 duration=yt_meta["duration"],
-                file_type="youtube",
-                added_by=user,
-                timestamp=timestamp
+                source="youtube",
+                added_by=user
             )
-            add_to_queue(**metadata)
+            await asyncio.to_thread(add_to_queue, **metadata)
             await message.reply_text(f"📺 *YouTube Added to Queue:*\n`{metadata['title']}`", parse_mode=constants.ParseMode.MARKDOWN)
             log.info(f"🎞️ YouTube video queued by {user}: {metadata['title']}")
         except Exception as e:
@@ -75,14 +74,14 @@ async def handle_upload(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         await message.reply_text("📩 Please send a valid movie file or YouTube link.")
 
 # 🏷️ Metadata constructor
-def build_metadata(title, file_path, duration, file_type, added_by, timestamp):
+def build_metadata(title, filepath, duration, source, added_by):
+    # Keys match add_to_queue()'s parameters; the queue stamps its own id and timestamp
     return {
         "title": title,
-        "file_path": file_path,
+        "filepath": filepath,
         "duration": duration,
-        "type": file_type,
-        "added_by": added_by,
-        "timestamp": timestamp
+        "source": source,
+        "added_by": added_by
     }
 
 # 📁 File download
@@ -91,54 +90,66 @@ async def download_file(file_obj, destination_dir):
     unique_name = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{safe_name}"
     output_path = Path(destination_dir) / unique_name
     file = await file_obj.get_file()
-    await file.download_to_drive(output_path)
+
+    # A local Bot API server hands back a path on this machine instead of a URL
+    local_source = Path(file.file_path) if file.file_path else None
+    if local_source and local_source.is_absolute() and local_source.is_file():
+        await asyncio.to_thread(_copy_in_kernel, local_source, output_path)
+    else:
+        await file.download_to_drive(output_path)
     log.debug(f"⬇️ File saved to {output_path}")
     return output_path
 
-# 📹 YouTube downloader via yt-dlp
-async def download_youtube_video(url, destination_dir):
-    output_template = f"{destination_dir}/%(title).200s.%(ext)s"
-    cmd = [
-        Config.YTDLP_PATH,
-        "-f", "bestvideo[ext=mp4]+bestaudio[ext=m4a]/mp4",
-        "--merge-output-format", "mp4",
-        "--no-playlist",
-        "--quiet",
-        "--no-warnings",
-        "--write-info-json",
-        "-o", output_template,
-        url
-    ]
+def _copy_in_kernel(src: Path, dst: Path):
+    """Copies with copy_file_range() so data never passes through user space (reflinks on Btrfs/XFS)."""
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), min(remaining, COPY_CHUNK_SIZE))
+                if copied == 0:
+                    break
+                remaining -= copied
+        if remaining == 0:
+            return
+    except OSError as e:
+        # EXDEV on older kernels, or a filesystem without copy_file_range support
+        log.debug(f"↪️ copy_file_range unavailable ({e}), falling back to copyfile")
+    shutil.copyfile(src, dst)
 
+# 📹 YouTube downloader via the yt-dlp API (runs in a worker thread)
+async def download_youtube_video(url, destination_dir):
     log.debug(f"🔗 Running yt-dlp: {url}")
-    result = subprocess.run(cmd, capture_output=True, text=True)
-
-    if result.returncode != 0:
-        raise RuntimeError(f"yt-dlp failed: {result.stderr.strip()}")
+    info, file_path = await asyncio.to_thread(_ytdlp_download, url, destination_dir)
 
-    downloaded_files = sorted(
-        Path(destination_dir).glob("*.mp4"),
-        key=lambda f: f.stat().st_mtime,
-        reverse=True
-    )
-
-    if not downloaded_files:
+    if not file_path.exists():
         raise FileNotFoundError("No .mp4 file found after download.")
 
-    latest_file = downloaded_files[0]
-    info_json = latest_file.with_suffix(".info.json")
-
-    if not info_json.exists():
-        raise FileNotFoundError("Missing metadata (.info.json).")
-
-    with open(info_json, "r", encoding="utf-8") as f:
-        info = json.load(f)
-
     return {
-        "title": info.get("title", latest_file.stem),
-        "filepath": str(latest_file),
-        "duration": int(info.get("duration", 0))
+        "title": info.get("title", file_path.stem),
+        "filepath": str(file_path),
+        "duration": int(info.get("duration") or 0)
+    }
+
+def _ytdlp_download(url, destination_dir):
+    options = {
+        "format": YTDLP_FORMAT,
+        "merge_output_format": "mp4",
+        "noplaylist": True,
+        "quiet": True,
+        "no_warnings": True,
+        "outtmpl": f"{destination_dir}/%(title).200s.%(ext)s",
     }
+    with YoutubeDL(options) as ydl:
+        info = ydl.extract_info(url, download=True)
+        # yt-dlp reports the final (post-merge) path for each requested download
+        requested = info.get("requested_downloads") or ()
+        if requested and requested[0].get("filepath"):
+            file_path = Path(requested[0]["filepath"])
+        else:
+            # Merged output always ends up as .mp4 regardless of the source stream extension
+            file_path = Path(ydl.prepare_filename(info)).with_suffix(".mp4")
+    return info, file_path
 
 # 🧼 Safe filenames
 def sanitize_filename(name: str) -> str:
@@ -0,0 +1,57 @@
+# moviebot/core/utils/fastjson.py
+
+import json
+from decimal import Decimal
+from pathlib import PurePath
+
+try:
+    import orjson
+except ImportError:  # Optional accelerator — fall back to the stdlib codec
+    orjson = None
+
+HAS_ORJSON = orjson is not None
+
+# 🎚️ orjson option sets, indexed by the indent flag
+_ORJSON_OPTIONS = (0, orjson.OPT_INDENT_2) if HAS_ORJSON else (0, 0)
+
+
+# 🧩 Fallback for types neither codec handles natively
+def _default(obj):
+    if isinstance(obj, PurePath):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# 📤 Serialize to UTF-8 bytes
+def dumps(obj, indent: bool = False) -> bytes:
+    """
+    Serializes an object to UTF-8 encoded JSON, using orjson when it is installed.
+    Paths, sets and Decimals are encoded as strings/lists by the shared _default.
+
+    Args:
+        obj: JSON-serializable data.
+        indent (bool): Pretty print with two-space indentation.
+
+    Example:
+        f.write(dumps({"a": 1}, indent=True))
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS[bool(indent)])
+    return json.dumps(obj, default=_default, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+# 📥 Parse from bytes or str
+def loads(data: bytes | str):
+    """
+    Parses JSON from bytes or str, using orjson when it is installed.
+
+    Raises:
+        json.JSONDecodeError: On malformed input (orjson's error subclasses it).
+    """
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -3,16 +3,178 @@
 import os
 import time
 import fcntl
+import signal
+import threading
 from pathlib import Path
 from contextlib import contextmanager
 
+from core.utils import fastjson
 from core.utils.logger import get_logger
 
 log = get_logger("🔐 filelock")
 
 # ⏲️ Configuration Constants
 DEFAULT_TIMEOUT = 10  # Maximum time (in seconds) to wait for lock
-DEFAULT_RETRY_DELAY = 0.1  # Delay between retries (in seconds)
+DEFAULT_RETRY_DELAY = 0.1  # Longest delay between retries (in seconds)
+RETRY_BACKOFF_START = 10  # First retry sleeps retry_delay / 10, doubling up to retry_delay
+
+# 🧵 In-process locks, one per absolute path. threading.RLock is implemented in C, lets a
+# thread that already holds a path re-enter it, and blocks with a timeout until release.
+_path_locks: dict[str, object] = {}
+_path_locks_guard = threading.Lock()
+_held = threading.local()  # .depth: dict[path, int], .files: dict[path, lock file] for the current thread
+
+
+def _path_lock(key: str):
+    lock = _path_locks.get(key)
+    if lock is None:
+        with _path_locks_guard:
+            lock = _path_locks.setdefault(key, threading.RLock())
+    return lock
+
+
+def _acquire_path_lock(lock, path: Path, start_time: float, timeout):
+    # Waiting threads sleep in the lock itself and wake as soon as the holder releases it
+    remaining = max(timeout - (time.time() - start_time), 0)
+    if not lock.acquire(timeout=remaining):
+        raise _lock_timeout(path, timeout)
+
+
+def _lock_timeout(path: Path, timeout):
+    log.error(f"⏱️ Timeout: Lock on {path.name} not acquired after {timeout}s")
+    return TimeoutError(f"Could not acquire lock on {path} within {timeout} seconds")
+
+
+def _acquire_flock(f, path: Path, start_time: float, timeout, retry_delay):
+    # SIGALRM can only be handled on the main thread, and only if no timer is armed already
+    if threading.current_thread() is threading.main_thread() and signal.getitimer(signal.ITIMER_REAL)[0] == 0:
+        _acquire_flock_alarm(f, path, start_time, timeout)
+    else:
+        _acquire_flock_polling(f, path, start_time, timeout, retry_delay)
+
+
+def _acquire_flock_alarm(f, path: Path, start_time: float, timeout):
+    """Blocks in flock() so the kernel wakes us on release; an interval timer enforces the timeout."""
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)  # Uncontended: no timer syscalls at all
+        log.debug(f"🔒 Lock acquired: {path.name}")
+        return
+    except BlockingIOError:
+        pass
+
+    remaining = timeout - (time.time() - start_time)
+    if remaining <= 0:
+        raise _lock_timeout(path, timeout)
+
+    def on_alarm(signum, frame):
+        raise _lock_timeout(path, timeout)
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    try:
+        signal.setitimer(signal.ITIMER_REAL, remaining)
+        fcntl.flock(f, fcntl.LOCK_EX)
+        log.debug(f"🔒 Lock acquired: {path.name}")
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _acquire_flock_polling(f, path: Path, start_time: float, timeout, retry_delay):
+    # Short contention is noticed within milliseconds, long contention still polls at retry_delay
+    delay = retry_delay / RETRY_BACKOFF_START
+    while True:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            log.debug(f"🔒 Lock acquired: {path.name}")
+            return
+        except BlockingIOError:
+            if time.time() - start_time > timeout:
+                raise _lock_timeout(path, timeout)
+            time.sleep(delay)
+            delay = min(delay * 2, retry_delay)
+
+# 🚩 open() mode -> os.open() flags; "w" and "a" create the file if it is missing
+_MODE_FLAGS = {
+    "r": os.O_RDONLY,
+    "r+": os.O_RDWR,
+    "w": os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+    "w+": os.O_RDWR | os.O_CREAT | os.O_TRUNC,
+    "a": os.O_WRONLY | os.O_CREAT | os.O_APPEND,
+    "a+": os.O_RDWR | os.O_CREAT | os.O_APPEND,
+}
+
+
+def _open_flags(mode: str) -> int:
+    try:
+        return _MODE_FLAGS[mode.replace("b", "").replace("t", "")] | os.O_CLOEXEC
+    except KeyError:
+        raise ValueError(f"Unsupported locked_file mode: {mode!r}") from None
+
+# 🔒 Exclusive Lock on a Data File
+class FileLock:
+    """
+    Exclusive lock guarding a data file, usable as a context manager.
+
+    The flock() is held on a sidecar "<name>.lock" file rather than on the data file
+    itself, so it stays valid while writers swap the data file with os.replace().
+    Re-entrant within a thread: a nested FileLock on a path the thread already holds
+    only bumps a depth counter instead of calling flock() again (which would deadlock).
+
+    Args:
+        path (str | Path): Data file to guard.
+        timeout (int): How many seconds to wait before giving up on acquiring the lock.
+        retry_delay (float): Longest sleep between retries.
+
+    Example:
+        with FileLock("playlist.json"):
+            data = read_locked_json("playlist.json")
+            write_locked_json("playlist.json", data[1:])
+    """
+
+    def __init__(self, path, timeout=DEFAULT_TIMEOUT, retry_delay=DEFAULT_RETRY_DELAY):
+        self.path = Path(path)
+        self.timeout = timeout
+        self.retry_delay = retry_delay
+        self._key = os.path.abspath(self.path)
+
+    def __enter__(self):
+        start_time = time.time()
+        thread_lock = _path_lock(self._key)
+        _acquire_path_lock(thread_lock, self.path, start_time, self.timeout)
+
+        depths = _held.__dict__.setdefault("depth", {})
+        files = _held.__dict__.setdefault("files", {})
+        try:
+            if depths.get(self._key, 0) == 0:
+                lock_file = os.fdopen(os.open(self._key + ".lock", os.O_RDWR | os.O_CREAT | os.O_CLOEXEC, 0o666), "rb")
+                try:
+                    _acquire_flock(lock_file, self.path, start_time, self.timeout, self.retry_delay)
+                except BaseException:
+                    lock_file.close()
+                    raise
+                files[self._key] = lock_file
+        except BaseException:
+            thread_lock.release()
+            raise
+        depths[self._key] = depths.get(self._key, 0) + 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        depths = _held.depth
+        depths[self._key] -= 1
+        try:
+            if depths[self._key] == 0:
+                lock_file = _held.files.pop(self._key)
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                    log.debug(f"🔓 Lock released: {self.path.name}")
+                except Exception as e:
+                    log.warning(f"⚠️ Could not release lock on {self.path.name}: {e}")
+                finally:
+                    lock_file.close()
+        finally:
+            _path_lock(self._key).release()
+        return False
 
 # 🧰 Atomic File Locking with Context Manager
 @contextmanager
@@ -20,6 +182,9 @@ def locked_file(path, mode="r+", timeout=DEFAULT_TIMEOUT, retry_delay=DEFAULT_RE
     """
     Secure context manager for atomic file access using POSIX locks (fcntl).
 
+    Holds FileLock(path) while the file is open, so it is re-entrant within a thread
+    and excludes every other FileLock / locked_file user of the same path.
+
     Args:
         path (str | Path): Path to the file to lock.
         mode (str): File open mode (e.g., 'r+', 'w', etc.).
@@ -31,61 +196,117 @@ def locked_file(path, mode="r+", timeout=DEFAULT_TIMEOUT, retry_delay=DEFAULT_RE
             data = json.load(f)
     """
     path = Path(path)
+    flags = _open_flags(mode)
 
-    if not path.exists() and ("w" in mode or "a" in mode):
-        try:
-            path.touch()
-            log.debug(f"📁 Created missing file: {path}")
-        except Exception as e:
-            log.error(f"❌ Failed to create file {path}: {e}")
-            raise
+    with FileLock(path, timeout, retry_delay):
+        # A single open(2) creates the file when the mode allows it, without a racy exists() check
+        with os.fdopen(os.open(path, flags, 0o666), mode) as f:
+            yield f
 
-    start_time = time.time()
+# 📖 Safe JSON Read Wrapper
 
-    with open(path, mode) as f:
-        while True:
-            try:
-                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
-                log.debug(f"🔒 Lock acquired: {path.name}")
-                break
-            except BlockingIOError:
-                if time.time() - start_time > timeout:
-                    log.error(f"⏱️ Timeout: Lock on {path.name} not acquired after {timeout}s")
-                    raise TimeoutError(f"Could not acquire lock on {path} within {timeout} seconds")
-                time.sleep(retry_delay)
+def read_locked_json(filepath: str | Path):
+    """
+    Reads and parses JSON from disk while holding the file lock.
+
+    Args:
+        filepath (str | Path): Source path.
+
+    Example:
+        data = read_locked_json("control.json")
+    """
+    with locked_file(filepath, mode="rb") as f:
+        return fastjson.loads(f.read())
 
-        try:
-            yield f
-        finally:
-            try:
-                fcntl.flock(f, fcntl.LOCK_UN)
-                log.debug(f"🔓 Lock released: {path.name}")
-            except Exception as e:
-                log.warning(f"⚠️ Could not release lock on {path.name}: {e}")
+
+def read_locked_json_stat(filepath: str | Path):
+    """
+    Like read_locked_json, but also returns os.fstat() of the descriptor the data came from,
+    so callers caching by mtime record exactly the version they parsed.
+
+    Example:
+        data, st = read_locked_json_stat("playlist.json")
+    """
+    with locked_file(filepath, mode="rb") as f:
+        st = os.fstat(f.fileno())
+        return fastjson.loads(f.read()), st
+
+# 📝 Temp-file helper shared by the writers below
+
+def _write_temp(path: Path, buf: bytes, durable: bool) -> tuple[Path, os.stat_result]:
+    """Writes buf to a sibling temp file (fsync'd when durable) and returns its path and fstat."""
+    tmp = path.with_name(f"{path.name}.tmp.{os.getpid()}.{threading.get_ident()}")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o666)
+    try:
+        view = memoryview(buf)
+        while view:
+            view = view[os.write(fd, view):]
+        if durable:
+            os.fsync(fd)
+        st = os.fstat(fd)
+    finally:
+        os.close(fd)
+    return tmp, st
 
 # ✏️ Safe JSON Write Wrapper
 
-def write_locked_json(filepath: str | Path, data: dict, indent: int = 2):
+def write_locked_json(filepath: str | Path, data: dict, indent: int = 2) -> os.stat_result:
     """
     Atomically writes JSON to disk using file locking.
 
+    The data is serialized and fsync'd into a temp file without any lock held; the
+    FileLock only covers the rename that swaps it into place. Returns the fstat of the
+    file that was renamed in, so callers can record its (st_ino, st_mtime_ns) without
+    a racy stat() of the path afterwards.
+
     Args:
         filepath (str | Path): Destination path.
         data (dict): JSON-serializable data.
-        indent (int): Pretty print indentation level.
+        indent (int): Pretty print when non-zero (orjson only supports two spaces).
 
     Example:
         write_locked_json("output.json", {"a": 1})
     """
+    path = Path(filepath)
+    tmp = None
     try:
-        with locked_file(filepath, mode="w") as f:
-            import json
-            json.dump(data, f, indent=indent)
-            f.flush()
-            os.fsync(f.fileno())
+        tmp, st = _write_temp(path, fastjson.dumps(data, indent=bool(indent)), durable=True)
+        # Lock the stable sidecar, not the data file: the rename retires the old inode
+        with FileLock(path):
+            os.replace(tmp, path)
         log.info(f"💾 JSON written safely to {filepath}")
+        return st
     except Exception as e:
         log.error(f"❌ Failed to write JSON to {filepath}: {e}")
+        if tmp is not None:
+            tmp.unlink(missing_ok=True)
+        raise
+
+# ⚛️ Lock-free Atomic Replace
+
+def atomic_write_json(filepath: str | Path, data):
+    """
+    Replaces a JSON file by writing a temp file beside it and renaming it into place.
+
+    rename() swaps the directory entry atomically, so readers always see either the
+    previous or the new file and need no lock. Use for small signal files.
+
+    Args:
+        filepath (str | Path): Destination path.
+        data: JSON-serializable data.
+
+    Example:
+        atomic_write_json("control.json", {"skip": True})
+    """
+    path = Path(filepath)
+    tmp = None
+    try:
+        tmp, _ = _write_temp(path, fastjson.dumps(data), durable=False)
+        os.replace(tmp, path)
+    except Exception as e:
+        log.error(f"❌ Failed to replace JSON at {filepath}: {e}")
+        if tmp is not None:
+            tmp.unlink(missing_ok=True)
         raise
 
 # 🧪 Debug Mode (manual test)
@@ -1,11 +1,31 @@
 import logging
 import os
-import json
+import gzip
+import time
+import queue
+import shutil
+import atexit
+import weakref
 import threading
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
 from datetime import datetime
 
+from core.utils import fastjson
+
+try:
+    import msgspec
+except ImportError:  # Optional accelerator — JSON logs fall back to fastjson
+    msgspec = None
+
+# None of our formats use thread/process names or caller file/line, so skip collecting them
+# per record (_srcfile = None disables findCaller's stack walk)
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+logging._srcfile = None
+
 # ==== CONFIGURATION ====
 DEFAULT_LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 ENABLE_JSON_LOGS = os.getenv("LOG_JSON", "0") == "1"
@@ -16,6 +36,10 @@ LOG_FILE = LOG_DIR / "moviebot.log"
 ERROR_LOG_FILE = LOG_DIR / "moviebot.error.log"
 MAX_LOG_SIZE_MB = 5
 BACKUP_COUNT = 5
+ERROR_FLUSH_TIMEOUT = 5  # seconds an ERROR+ call waits for the listener to write it
+LOG_BUFFER_SIZE = max(int(os.getenv("LOG_BUFFER_KB", "128")), 1) * 1024  # bytes buffered per log file before a write()
+LOG_FLUSH_INTERVAL = 30  # seconds between background flushes of buffered log files
+GZIP_CHUNK_SIZE = 128 * 1024
 
 LOG_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
@@ -24,38 +48,237 @@ DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 _logger_lock = threading.Lock()
 
+# File and console I/O happens on one listener thread; callers only enqueue
+_log_queue = queue.SimpleQueue()
+_listener = None
+
+# Buffered file handlers flushed by the background flusher thread
+_buffered_handlers = weakref.WeakSet()
+_flusher = None
+
+# Rotated logs are gzipped here so rollover never blocks on compression
+_rotation_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-rotate")
+
 # ANSI Color Codes
 LEVEL_COLORS = {
-    "DEBUG": "\033[94m",
-    "INFO": "\033[92m",
-    "WARNING": "\033[93m",
-    "ERROR": "\033[91m",
-    "CRITICAL": "\033[95m",
+    logging.DEBUG: "\033[94m",
+    logging.INFO: "\033[92m",
+    logging.WARNING: "\033[93m",
+    logging.ERROR: "\033[91m",
+    logging.CRITICAL: "\033[95m",
 }
 COLOR_RESET = "\033[0m"
 
 
-class JsonFormatter(logging.Formatter):
-    def format(self, record):
-        log_record = {
+_time_cache = (None, None, "")  # (epoch second, datefmt, formatted) shared by all formatters
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter that runs strftime() once per wall-clock second (DATE_FORMAT has second resolution)."""
+
+    def formatTime(self, record, datefmt=None):
+        global _time_cache
+        if not datefmt:
+            return super().formatTime(record, datefmt)  # Default format includes milliseconds
+        second = int(record.created)
+        cached_second, cached_fmt, text = _time_cache
+        if cached_second == second and cached_fmt == datefmt:
+            return text
+        text = time.strftime(datefmt, self.converter(second))
+        _time_cache = (second, datefmt, text)
+        return text
+
+
+if msgspec is not None:
+    class _JsonLogRecord(msgspec.Struct):
+        """Schema for JSON log lines; msgspec encodes it without building a dict."""
+        timestamp: str
+        level: str
+        module: str
+        message: str
+
+    _encode_log_record = msgspec.json.Encoder().encode
+
+
+class JsonFormatter(CachedTimeFormatter):
+    def format_bytes(self, record) -> bytes:
+        """UTF-8 JSON for the record; binary handlers write this without a decode/encode round trip."""
+        if msgspec is not None:
+            return _encode_log_record(_JsonLogRecord(
+                self.formatTime(record, self.datefmt),
+                record.levelname,
+                record.name,
+                record.getMessage(),
+            ))
+        return fastjson.dumps({
             "timestamp": self.formatTime(record, self.datefmt),
             "level": record.levelname,
             "module": record.name,
             "message": record.getMessage(),
-        }
-        return json.dumps(log_record)
+        })
 
+    def format(self, record):
+        return self.format_bytes(record).decode("utf-8")
+
+
+class ColoredFormatter(CachedTimeFormatter):
+    """Formats with one pre-built, color-wrapped Formatter per level."""
+
+    def __init__(self, fmt=None, datefmt=None):
+        super().__init__(fmt, datefmt)
+        # Indexed by levelno // 10 - 1: DEBUG, INFO, WARNING, ERROR, CRITICAL
+        self._level_formatters = tuple(
+            CachedTimeFormatter(f"{LEVEL_COLORS[levelno]}{self._fmt}{COLOR_RESET}", datefmt)
+            for levelno in sorted(LEVEL_COLORS)
+        )
 
-class ColoredFormatter(logging.Formatter):
     def format(self, record):
-        color = LEVEL_COLORS.get(record.levelname, "")
-        reset = COLOR_RESET if color else ""
-        base_msg = super().format(record)
-        return f"{color}{base_msg}{reset}"
+        index = record.levelno // 10 - 1
+        if 0 <= index < len(self._level_formatters):
+            return self._level_formatters[index].format(record)
+        return super().format(record)
+
+
+def _dispatch(sinks, record):
+    for handler in sinks:
+        if record.levelno >= handler.level:
+            handler.handle(record)
+
+
+class _SinkQueueHandler(QueueHandler):
+    """Enqueues records together with the handlers of the logger that emitted them."""
+
+    def __init__(self, sinks):
+        super().__init__(_log_queue)
+        self.sinks = sinks
+
+    def enqueue(self, record, written=None):
+        self.queue.put_nowait((self.sinks, record, written))
+
+    def emit(self, record):
+        if record.levelno < logging.ERROR:
+            super().emit(record)
+            return
+
+        # Errors block until written, so they reach disk even if we crash next,
+        # and still land after everything queued before them
+        worker = getattr(_listener, "_thread", None)
+        if worker is None or worker is threading.current_thread():
+            _dispatch(self.sinks, record)
+            return
+        try:
+            written = threading.Event()
+            self.enqueue(self.prepare(record), written)
+            written.wait(ERROR_FLUSH_TIMEOUT)
+        except Exception:
+            self.handleError(record)
+
+
+class _SinkQueueListener(QueueListener):
+    def handle(self, item):
+        sinks, record, written = item
+        try:
+            _dispatch(sinks, record)
+        finally:
+            if written is not None:
+                written.set()
+
+
+def _ensure_listener():
+    global _listener
+    if _listener is None:
+        _listener = _SinkQueueListener(_log_queue)
+        _listener.start()
+        atexit.register(_listener.stop)  # Drains whatever is still queued
+
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that writes encoded records into a large binary buffer.
+
+    Many small records become one write() per LOG_BUFFER_SIZE bytes. The buffer is
+    flushed on ERROR+ records, on rotation, every LOG_FLUSH_INTERVAL seconds and at exit.
+    Rollover is decided from an in-process byte counter, so each record is formatted
+    once and never costs a seek or stat. Backups are gzipped (name.N.gz) in the background.
+    """
+
+    _bytes_written = 0
+    _compression = None  # Future of the last background gzip
+
+    def rotation_filename(self, default_name):
+        return default_name + ".gz"
+
+    def rotate(self, source, dest):
+        if not os.path.exists(source):
+            return
+        # Only the rename happens inline; the new file is reopened right after
+        uncompressed = dest[:-len(".gz")]
+        os.rename(source, uncompressed)
+        try:
+            self._compression = _rotation_executor.submit(_gzip_and_remove, uncompressed, dest)
+        except RuntimeError:
+            _gzip_and_remove(uncompressed, dest)  # Executor already shut down at exit
+
+    def doRollover(self):
+        # Backups are shifted by name, so let the previous gzip land first (normally long done)
+        if self._compression is not None:
+            wait([self._compression])
+            self._compression = None
+        super().doRollover()
+
+    def _open(self):
+        stream = open(self.baseFilename, self.mode + "b", buffering=LOG_BUFFER_SIZE)
+        self._bytes_written = stream.tell()  # Append mode starts at the current file size
+        return stream
+
+    def _would_overflow(self, size):
+        return self.maxBytes > 0 and self._bytes_written > 0 and self._bytes_written + size >= self.maxBytes
+
+    def shouldRollover(self, record):
+        return self._would_overflow(len(self.format(record)) + len(self.terminator))
+
+    def emit(self, record):
+        try:
+            if isinstance(self.formatter, JsonFormatter):
+                data = self.formatter.format_bytes(record) + self.terminator.encode()
+            else:
+                data = (self.format(record) + self.terminator).encode(self.encoding or "utf-8")
+            if self.stream is None:
+                self.stream = self._open()
+            if self._would_overflow(len(data)):
+                self.doRollover()  # Reopens the stream, which resets the counter
+            self.stream.write(data)
+            self._bytes_written += len(data)
+            if record.levelno >= logging.ERROR:
+                self.stream.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+def _gzip_and_remove(src, dest):
+    with open(src, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out, GZIP_CHUNK_SIZE)
+    os.unlink(src)
+
+
+def _flush_loop():
+    while True:
+        time.sleep(LOG_FLUSH_INTERVAL)
+        for handler in list(_buffered_handlers):
+            handler.flush()
+
+
+def _ensure_flusher():
+    global _flusher
+    if _flusher is None:
+        _flusher = threading.Thread(target=_flush_loop, name="log-flusher", daemon=True)
+        _flusher.start()
 
 
 def _create_handler(file_path, level=logging.INFO, json_output=False):
-    handler = RotatingFileHandler(
+    handler = BufferedRotatingFileHandler(
         file_path,
         maxBytes=MAX_LOG_SIZE_MB * 1024 * 1024,
         backupCount=BACKUP_COUNT,
@@ -64,42 +287,66 @@ def _create_handler(file_path, level=logging.INFO, json_output=False):
     formatter = (
         JsonFormatter(datefmt=DATE_FORMAT)
         if json_output else
-        logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT)
+        CachedTimeFormatter(LOG_FORMAT, datefmt=DATE_FORMAT)
     )
     handler.setFormatter(formatter)
     handler.setLevel(level)
+    _buffered_handlers.add(handler)
+    _ensure_flusher()
     return handler
 
 
-def _create_console_handler(level=None, json_output=False):
+def _create_console_handler(json_output=False):
     stream_handler = logging.StreamHandler()
     formatter = (
         JsonFormatter(datefmt=DATE_FORMAT)
         if json_output else
         ColoredFormatter(LOG_FORMAT, datefmt=DATE_FORMAT)
         if ENABLE_COLOR else
-        logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT)
+        CachedTimeFormatter(LOG_FORMAT, datefmt=DATE_FORMAT)
     )
     stream_handler.setFormatter(formatter)
-    stream_handler.setLevel(level or DEFAULT_LOG_LEVEL)
+    # Shared by every logger, so each logger's own level does the filtering
+    stream_handler.setLevel(logging.NOTSET)
     return stream_handler
 
 
+# One set of handlers per output style, shared by all loggers: one open file and one
+# rotation decision per log file, however many modules call get_logger()
+_shared_sinks: dict[bool, tuple] = {}
+
+
+def _sinks_for(json_output):
+    sinks = _shared_sinks.get(json_output)
+    if sinks is None:
+        sinks = _shared_sinks[json_output] = (
+            _create_handler(LOG_FILE, logging.INFO, json_output),
+            _create_handler(ERROR_LOG_FILE, logging.ERROR, json_output),
+            _create_console_handler(json_output),
+        )
+    return sinks
+
+
+with _logger_lock:
+    _sinks_for(ENABLE_JSON_LOGS)
+
+
 def get_logger(name="moviebot", level=None, json_output=ENABLE_JSON_LOGS):
-    with _logger_lock:
-        logger = logging.getLogger(name)
+    logger = logging.getLogger(name)
+    if logger.handlers:
+        return logger  # Already configured: skip the lock entirely
 
+    with _logger_lock:
         if logger.handlers:
-            return logger  # Avoid adding handlers multiple times
+            return logger  # Another thread configured it while we waited
 
         logger.setLevel(level or DEFAULT_LOG_LEVEL)
 
-        # Handlers
-        logger.addHandler(_create_handler(LOG_FILE, logging.INFO, json_output))
-        logger.addHandler(_create_handler(ERROR_LOG_FILE, logging.ERROR, json_output))
-        logger.addHandler(_create_console_handler(level, json_output))
-
+        # Shared handlers, written to from the listener thread
+        sinks = _sinks_for(json_output)
+        _ensure_listener()
         logger.propagate = False
+        logger.addHandler(_SinkQueueHandler(sinks))  # Last, so the unlocked check sees a ready logger
         return logger
 
 
@@ -0,0 +1,164 @@
+# moviebot/core/utils/spawn.py
+
+import os
+import time
+import select
+import signal
+from typing import Optional, Sequence, Tuple
+
+from core.utils.logger import get_logger
+
+log = get_logger("🚀 spawn")
+
+# 📦 Read size when draining a child's output pipe
+PIPE_READ_SIZE = 65536
+# Python ignores these at startup; reset them in children like Popen(restore_signals=True)
+RESTORED_SIGNALS = (signal.SIGPIPE, signal.SIGXFSZ)
+WAIT_POLL_INTERVAL = 0.05  # seconds between reap attempts when pidfd_open() is unavailable
+
+
+# 🧾 Run a short-lived command and capture its output
+def run_captured(argv: Sequence[str], timeout: Optional[float] = None) -> Tuple[int, str]:
+    """
+    Runs a command via posix_spawnp and waits for it, collecting stdout and stderr.
+
+    posix_spawn is vfork-based, so unlike subprocess (fork + exec) it does not
+    duplicate the page tables of a large bot process just to exec a helper.
+
+    Args:
+        argv (Sequence[str]): Command and arguments; argv[0] is resolved via PATH.
+        timeout (float | None): Seconds to wait before the child is killed.
+
+    Returns:
+        Tuple[int, str]: Exit code and the combined stdout/stderr output.
+
+    Raises:
+        TimeoutError: The command did not finish within timeout seconds.
+
+    Example:
+        code, output = run_captured(("lsmod",), timeout=5)
+    """
+    read_fd, write_fd = os.pipe2(os.O_CLOEXEC)
+    file_actions = [
+        (os.POSIX_SPAWN_DUP2, write_fd, 1),
+        (os.POSIX_SPAWN_DUP2, write_fd, 2),
+    ]
+    try:
+        pid = os.posix_spawnp(argv[0], list(argv), os.environ, file_actions=file_actions,
+                              setsigdef=RESTORED_SIGNALS)
+    except OSError:
+        os.close(read_fd)
+        raise
+    finally:
+        os.close(write_fd)
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    poller = select.poll()
+    poller.register(read_fd, select.POLLIN)
+    chunks = []
+    try:
+        while True:
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not poller.poll(remaining * 1000):
+                    os.kill(pid, signal.SIGKILL)
+                    os.waitpid(pid, 0)
+                    log.warning(f"⏰ {argv[0]} killed after {timeout}s")
+                    raise TimeoutError(f"{argv[0]} did not finish within {timeout}s")
+            chunk = os.read(read_fd, PIPE_READ_SIZE)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        os.close(read_fd)
+
+    _, status = os.waitpid(pid, 0)
+    returncode = os.waitstatus_to_exitcode(status)
+    log.debug(f"🧾 {argv[0]} exited with code {returncode}")
+    return returncode, b"".join(chunks).decode(errors="replace")
+
+
+# 👻 Launch a long-running command with output discarded
+def spawn_detached(argv: Sequence[str]) -> int:
+    """
+    Starts a background command via posix_spawnp with stdout/stderr sent to /dev/null.
+
+    Args:
+        argv (Sequence[str]): Command and arguments; argv[0] is resolved via PATH.
+
+    Returns:
+        int: PID of the spawned process. The caller is responsible for reaping it.
+    """
+    file_actions = [
+        (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0),
+        (os.POSIX_SPAWN_DUP2, 1, 2),
+    ]
+    pid = os.posix_spawnp(argv[0], list(argv), os.environ, file_actions=file_actions,
+                          setsigdef=RESTORED_SIGNALS)
+    log.debug(f"👻 Spawned {argv[0]} (PID {pid})")
+    return pid
+
+
+# 🧒 Minimal Popen-style handle for a posix_spawn'ed child
+class SpawnedProcess:
+    """
+    Wraps a child PID with the subset of subprocess.Popen the player relies on.
+
+    Example:
+        proc = SpawnedProcess(spawn_detached(("ffmpeg", "-i", "in.mp4", "out.mkv")))
+        if proc.poll() is None:
+            proc.terminate()
+            proc.wait(5)
+    """
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.returncode: Optional[int] = None
+
+    def poll(self) -> Optional[int]:
+        """Reaps the child if it has exited; returns its exit code, or None while running."""
+        if self.returncode is None:
+            try:
+                pid, status = os.waitpid(self.pid, os.WNOHANG)
+            except ChildProcessError:
+                self.returncode = 0  # Already reaped elsewhere; same fallback as Popen
+            else:
+                if pid != 0:
+                    self.returncode = os.waitstatus_to_exitcode(status)
+        return self.returncode
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[int]:
+        """Waits for the child to exit; returns None if timeout seconds pass first."""
+        if self.poll() is not None:
+            return self.returncode
+        try:
+            pidfd = os.pidfd_open(self.pid)
+        except (OSError, AttributeError):
+            return self._wait_polling(timeout)  # Pre-5.3 kernel or non-Linux
+
+        # The pidfd turns readable once the child exits, so a single poll() covers the wait
+        try:
+            poller = select.poll()
+            poller.register(pidfd, select.POLLIN)
+            poller.poll(None if timeout is None else timeout * 1000)
+        finally:
+            os.close(pidfd)
+        return self.poll()
+
+    def _wait_polling(self, timeout: Optional[float]) -> Optional[int]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.poll() is None:
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(WAIT_POLL_INTERVAL)
+        return self.returncode
+
+    def send_signal(self, sig: int):
+        if self.poll() is None:
+            os.kill(self.pid, sig)
+
+    def terminate(self):
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self):
+        self.send_signal(signal.SIGKILL)
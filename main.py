@@ -1,7 +1,6 @@
 import threading
 import asyncio
 import signal
-import time
 import sys
 from functools import partial
 
@@ -19,6 +18,7 @@ threads = {}
 running = True
 thread_targets = {}
 restart_counters = {}
+loop = None  # Supervisor event loop, set in main()
 
 MAX_RESTART_ATTEMPTS = 5
 RESTART_BACKOFF = 5  # seconds
@@ -31,12 +31,22 @@ def start_thread(name, target, daemon=True):
             target()
         except Exception as e:
             logger.log_error(f"💥 Thread '{name}' crashed: {e}")
+        finally:
+            # Wake the supervisor loop instead of having it poll is_alive()
+            try:
+                loop.call_soon_threadsafe(exited.set_result, None)
+            except RuntimeError:
+                pass  # Loop already closed during shutdown
 
     if name in threads and threads[name].is_alive():
         logger.log_warning(f"⚠️ Attempted to start thread '{name}' but it's already running.")
         return
 
+    # Daemon threads rather than run_in_executor: executor workers are joined at exit
+    # and would block shutdown on targets that never return.
     t = threading.Thread(target=wrapper, daemon=daemon)
+    exited = loop.create_future()
+    exited.add_done_callback(partial(schedule_restart, name, t))
     threads[name] = t
     thread_targets[name] = target
     restart_counters.setdefault(name, 0)
@@ -67,25 +77,40 @@ def init_all():
     start_async_thread("TelegramControl", telegramcontrol.run)
 
 
-def monitor():
-    logger.log_info("🩺 Monitor thread active. Watching services...")
-    while running:
-        for name, thread in list(threads.items()):
-            if not thread.is_alive():
-                logger.log_warning(f"⚠️ Thread '{name}' is no longer alive.")
-                attempts = restart_counters.get(name, 0)
-                if attempts >= MAX_RESTART_ATTEMPTS:
-                    logger.log_critical(f"❌ Max restart attempts reached for '{name}'. Skipping restart.")
-                    continue
+def schedule_restart(name, thread, _future):
+    if not running or threads.get(name) is not thread:
+        return  # Shutting down, or the thread was already replaced
+
+    logger.log_warning(f"⚠️ Thread '{name}' is no longer alive.")
+    attempts = restart_counters.get(name, 0)
+    if attempts >= MAX_RESTART_ATTEMPTS:
+        logger.log_critical(f"❌ Max restart attempts reached for '{name}'. Skipping restart.")
+        return
+
+    logger.log_info(f"🔄 Attempting to restart '{name}' (attempt {attempts + 1})...")
+    restart_counters[name] += 1
+    loop.call_later(RESTART_BACKOFF, restart_thread, name)
+
+
+def restart_thread(name):
+    if not running:
+        return
+    try:
+        start_thread(name, thread_targets[name])
+    except Exception as e:
+        logger.log_error(f"❌ Failed to restart '{name}': {e}")
 
-                logger.log_info(f"🔄 Attempting to restart '{name}' (attempt {attempts + 1})...")
-                time.sleep(RESTART_BACKOFF)
-                restart_counters[name] += 1
-                try:
-                    start_thread(name, thread_targets[name])
-                except Exception as e:
-                    logger.log_error(f"❌ Failed to restart '{name}': {e}")
-        time.sleep(3)
+
+async def main():
+    global loop
+    loop = asyncio.get_running_loop()
+    stop_requested = asyncio.Event()
+    loop.add_signal_handler(signal.SIGINT, stop_requested.set)
+    loop.add_signal_handler(signal.SIGTERM, stop_requested.set)
+
+    init_all()
+    logger.log_info("🩺 Supervisor active. Watching services...")
+    await stop_requested.wait()
 
 
 def shutdown(signum=None, frame=None):
@@ -144,12 +169,8 @@ def manual_restart(name: str):
 
 
 if __name__ == "__main__":
-    signal.signal(signal.SIGINT, shutdown)
-    signal.signal(signal.SIGTERM, shutdown)
-
     try:
-        init_all()
-        monitor()
+        asyncio.run(main())
     except Exception as e:
         logger.log_critical(f"🔥 Fatal error in main loop: {e}")
-        shutdown()
+    shutdown()